@@ -1,6 +1,8 @@
 class YPBotError(Exception):
     """Кастомное исключение для обработки работы бота."""
 
+    __slots__ = ("func", "message", "error")
+
     def __init__(self, func, message, error=None):
         """Инициализация атрибутов экземпляра."""
         self.func = func
@@ -17,4 +19,4 @@ class YPBotError(Exception):
 class NotUpdatedError(Exception):
     """Кастомное исключение для обработки отсутствия обновлений."""
 
-    pass
+    __slots__ = ()
@@ -1,20 +1,37 @@
-import http
 import logging
 import os
+import signal
 import sys
 import time
 from datetime import datetime
+from functools import lru_cache
+from http import HTTPStatus
 from logging import StreamHandler, getLogger
 from logging.handlers import RotatingFileHandler
-from typing import Dict, List, Optional, Type, Union
+from types import FrameType
+from typing import Dict, List, Optional, Tuple, Type, Union
 
 import requests
 from dotenv import load_dotenv
 import telegram
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from ciso8601 import parse_datetime
+except ImportError:
+    parse_datetime = None
 
 from exceptions import NotUpdatedError, YPBotError
 
+if parse_datetime is None:
+    def parse_datetime(date_string: str) -> datetime:
+        """Разбор даты из ответа АПИ, если ciso8601 не установлен."""
+        return datetime.fromisoformat(date_string.replace("Z", "+00:00"))
+
 load_dotenv()
 
 PRACTICUM_TOKEN: Optional[str] = os.getenv("YP_TOKEN")
@@ -22,7 +39,9 @@ TELEGRAM_TOKEN: Optional[str] = os.getenv("BOT_TOKEN")
 TELEGRAM_CHAT_ID: Optional[str] = os.getenv("CHAT_ID")
 
 RETRY_PERIOD: int = 600
+MAX_RETRY_PERIOD: int = 1800
 ENDPOINT: str = "https://practicum.yandex.ru/api/user_api/homework_statuses/"
+REQUEST_TIMEOUT: Tuple[int, int] = (5, 30)
 HEADERS: Dict[str, str] = {"Authorization": f"OAuth {PRACTICUM_TOKEN}"}
 
 HOMEWORK_VERDICTS: Dict[str, str] = {
@@ -37,6 +56,7 @@ SINGLE_HW_ANNOTATION = Dict[str, Union[str, int]]
 HW_LIST_ANNOTATION = List[SINGLE_HW_ANNOTATION]
 FROM_JSON_ANNOTATION = Dict[str, Union[HW_LIST_ANNOTATION, int]]
 TIMESTAMP_ANNOTATION = Union[datetime, int]
+STATUS_UPDATE_ANNOTATION = Tuple[str, str, str]
 
 
 def send_message(bot: Type[telegram.Bot], message: str) -> None:
@@ -52,6 +72,15 @@ def send_message(bot: Type[telegram.Bot], message: str) -> None:
         )
 
 
+def decode_response(
+    response: requests.models.Response,
+) -> FROM_JSON_ANNOTATION:
+    """Десериализация ответа АПИ: через orjson, если он установлен."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
 def get_api_answer(
     current_timestamp: TIMESTAMP_ANNOTATION,
 ) -> FROM_JSON_ANNOTATION:
@@ -60,19 +89,20 @@ def get_api_answer(
         current_timestamp = int(current_timestamp.timestamp())
 
     params: Dict[str, TIMESTAMP_ANNOTATION] = {"from_date": current_timestamp}
-    payload = {"url": ENDPOINT, "headers": HEADERS, "params": params}
     try:
-        response: requests.models.Response = requests.get(**payload)
+        response: requests.models.Response = requests.get(
+            ENDPOINT, headers=HEADERS, params=params, timeout=REQUEST_TIMEOUT
+        )
     except requests.exceptions.RequestException as error:
         raise YPBotError(
             get_api_answer.__name__, "Ошибка соединения с АПИ", error
         )
 
-    if response.status_code != http.HTTPStatus.OK:
+    if response.status_code != HTTPStatus.OK:
         raise YPBotError(get_api_answer.__name__, "Некорретный статус ответа")
 
     try:
-        return response.json()
+        return decode_response(response)
     except Exception as error:
         raise YPBotError(
             get_api_answer.__name__, "Ошибка десериализации", error
@@ -81,65 +111,113 @@ def get_api_answer(
 
 def check_response(response: FROM_JSON_ANNOTATION) -> HW_LIST_ANNOTATION:
     """Проверка соответствия ответа от АПИ ожидаемым параметрам."""
-    if not isinstance(response, dict):
-        raise TypeError("Ответ приходит не в виде словаря")
-    keys = ["homeworks", "current_date"]
-    for key in keys:
-        if key not in response:
-            raise YPBotError(
-                check_response.__name__, f"В ответе отсутствует ключ {key}"
-            )
-    if not isinstance(response["homeworks"], list):
+    try:
+        homeworks: HW_LIST_ANNOTATION = response["homeworks"]
+        # Значение не нужно - только проверка наличия ключа
+        response["current_date"]
+    except KeyError as error:
+        raise YPBotError(
+            check_response.__name__,
+            f"В ответе отсутствует ключ {error.args[0]}",
+        ) from error
+    except TypeError as error:
+        raise TypeError("Ответ приходит не в виде словаря") from error
+    if type(homeworks) is not list:
         raise TypeError(
             check_response.__name__, "По ключу homeworks доступен не список"
         )
-    return response["homeworks"]
+    return homeworks
 
 
 def parse_status(homework: SINGLE_HW_ANNOTATION) -> str:
     """Формирование сообщения для отправки в чат."""
-    if "homework_name" not in homework:
+    homework_name: Optional[str] = homework.get("homework_name")
+    if homework_name is None:
         raise KeyError("В ответе от АПИ отсутствует ключ homework_name")
-    if "status" not in homework:
+    homework_status: Optional[str] = homework.get("status")
+    if homework_status is None:
         raise KeyError("В ответе от АПИ отсутствует ключ status")
-    homework_name: str = homework["homework_name"]
-    homework_status: str = homework["status"]
 
-    if homework_status not in HOMEWORK_VERDICTS:
-        raise KeyError("В ответе от АПИ отсутствует ключ status")
+    return format_status_message(homework_name, homework_status)
 
-    verdict: str = HOMEWORK_VERDICTS[homework_status]
 
+@lru_cache(maxsize=256)
+def format_status_message(homework_name: str, homework_status: str) -> str:
+    """Текст сообщения о статусе; повторные пары берутся из кэша."""
+    verdict: Optional[str] = HOMEWORK_VERDICTS.get(homework_status)
+    if verdict is None:
+        raise KeyError(f"Неизвестный статус работы: {homework_status}")
     return f'Изменился статус проверки работы "{homework_name}". {verdict}'
 
 
+def get_status_updates(
+    homeworks: HW_LIST_ANNOTATION, statuses: Dict[str, str]
+) -> Tuple[List[STATUS_UPDATE_ANNOTATION], List[str]]:
+    """Сбор работ с изменившимся статусом: (название, статус, сообщение).
+
+    В statuses хранится последний отправленный статус каждой работы.
+    Некорректная работа не прерывает разбор остальных: описание ошибки
+    попадает во второй возвращаемый список.
+    """
+    updates: List[STATUS_UPDATE_ANNOTATION] = []
+    errors: List[str] = []
+    for homework in homeworks:
+        try:
+            homework_name: Optional[str] = homework.get("homework_name")
+            homework_status: Optional[str] = homework.get("status")
+            if (
+                homework_name in statuses
+                and statuses[homework_name] == homework_status
+            ):
+                continue
+            message: str = parse_status(homework)
+        except (AttributeError, KeyError) as error:
+            logger.error("Пропущена работа из ответа АПИ: %s", error)
+            errors.append(str(error.args[0]))
+            continue
+        updates.append((homework_name, homework_status, message))
+    return updates, errors
+
+
 def check_tokens() -> bool:
     """Проверка наличия токенов и чат ID.
 
     Обязательные данные для запуска программы.
     """
-    return all([TELEGRAM_TOKEN, PRACTICUM_TOKEN, TELEGRAM_CHAT_ID])
+    tokens: Dict[str, Optional[str]] = {
+        "YP_TOKEN": PRACTICUM_TOKEN,
+        "BOT_TOKEN": TELEGRAM_TOKEN,
+        "CHAT_ID": TELEGRAM_CHAT_ID,
+    }
+    missing_tokens: List[str] = [
+        env_name for env_name, token in tokens.items() if not token
+    ]
+    if missing_tokens:
+        logger.critical(
+            "Отсутствуют переменные окружения: %s", ", ".join(missing_tokens)
+        )
+    return not missing_tokens
 
 
 # Пока функцию удалять не буду - надо узнать, корректно ли отработает без нее.
 def get_current_time() -> TIMESTAMP_ANNOTATION:
     """Создание точки отсчета для последующих запросов."""
-    payload = {"url": ENDPOINT, "headers": HEADERS, "params": {"from_date": 0}}
-    response: requests.models.Response = requests.get(**payload)
     try:
-        response_json: FROM_JSON_ANNOTATION = response.json()
-        last_homework: SINGLE_HW_ANNOTATION = response_json["homeworks"][0]
+        response: FROM_JSON_ANNOTATION = get_api_answer(0)
+        last_homework: SINGLE_HW_ANNOTATION = response["homeworks"][0]
         if last_homework["status"] == "approved":
-            return response_json["current_date"]
-        date_: str = last_homework["date_updated"]
-        return datetime.fromisoformat(date_[:-1])
+            return response["current_date"]
+        return parse_datetime(last_homework["date_updated"])
     except Exception:
-        return int(datetime.utcnow().timestamp())
+        return int(time.time())
 
 
 def get_logger() -> logging.Logger:
     """Создание и настройка логгера."""
     logger: LOGGER_ANNOTATION = getLogger(__name__)
+    # Повторный вызов не должен навешивать дублирующие обработчики
+    if logger.handlers:
+        return logger
     logger.setLevel(logging.DEBUG)
     # Для вывода в файл
     # handler: logging.StreamHandler = RotatingFileHandler(
@@ -157,18 +235,45 @@ def get_logger() -> logging.Logger:
     return logger
 
 
+def send_error_message(
+    bot: Type[telegram.Bot],
+    message: Optional[str],
+    last_message: Optional[str],
+) -> Optional[str]:
+    """Отправка сообщения о сбое без прерывания основного цикла.
+
+    Повтор предыдущего сообщения не отправляется. Возвращается
+    сообщение, которое теперь считается последним.
+    """
+    if not message or message == last_message:
+        return last_message
+    try:
+        send_message(bot, message)
+    except YPBotError as error:
+        logger.error(error, exc_info=True)
+    return message
+
+
+def stop_bot(signum: int, frame: Optional[FrameType]) -> None:
+    """Штатная остановка бота по SIGTERM, в том числе во время паузы."""
+    logger.info("Получен сигнал %s, остановка бота", signum)
+    sys.exit(0)
+
+
 def main():
     """Основная логика работы программы."""
     logger.info("Начало логгирования")
     if not check_tokens():
-        logger.critical("Отсутствуют нужные параметры")
         sys.exit("Отсутствуют нужные параметры")
 
     bot: Type[telegram.Bot.__class__] = telegram.Bot(token=TELEGRAM_TOKEN)
-    message: Optional[str] = None
+    statuses: Dict[str, str] = {}
     error_message: Optional[str] = None
     new_error_message: Optional[str] = None
-    new_message: Optional[str] = None
+    # Пока обновлений нет, пауза между запросами удваивается
+    # (начиная со второго пустого ответа) до MAX_RETRY_PERIOD.
+    retry_period: int = RETRY_PERIOD
+    next_retry_period: int = RETRY_PERIOD
     current_timestamp = get_current_time()
 
     while True:
@@ -177,21 +282,32 @@ def main():
             logger.info("Попытка получения ответа от АПИ")
             response: FROM_JSON_ANNOTATION = get_api_answer(current_timestamp)
             logger.info("Ответ от АПИ получен")
+
+            checked_response: HW_LIST_ANNOTATION = check_response(response)
+            updates, errors = get_status_updates(checked_response, statuses)
+            if updates:
+                send_message(
+                    bot, "\n\n".join(message for _, _, message in updates)
+                )
+                statuses.update((name, status) for name, status, _ in updates)
+                retry_period = next_retry_period = RETRY_PERIOD
+            # Сдвигаем точку отсчета только после отправки: иначе при сбое
+            # Телеграма АПИ больше не вернет эти работы.
             current_timestamp: int = response.get(
                 "current_date", current_timestamp
             )
-
-            checked_response: HW_LIST_ANNOTATION = check_response(response)
-            if checked_response:
-                new_message: str = parse_status(checked_response[0])
-            if new_message != message:
-                message = new_message
-                send_message(bot, message)
-            else:
+            if errors:
+                raise YPBotError(
+                    get_status_updates.__name__,
+                    f"Пропущены некорректные работы: {'; '.join(errors)}",
+                )
+            if not updates:
                 raise NotUpdatedError("Нет обновлений")
 
         except NotUpdatedError as error:
             logger.debug(error)
+            retry_period = next_retry_period
+            next_retry_period = min(retry_period * 2, MAX_RETRY_PERIOD)
 
         except YPBotError as error:
             logger.error(error, exc_info=True)
@@ -201,22 +317,22 @@ def main():
 
         except Exception as error:
             logger.critical(
-                f"Непредвиденная ошибка {type(error).__name__} {error}",
+                "Непредвиденная ошибка %s %s",
+                type(error).__name__,
+                error,
                 exc_info=True,
             )
             new_error_message: str = f"Сбой в работе программы: {error}"
 
-        finally:
-            if new_error_message and new_error_message != error_message:
-                error_message = new_error_message
-                try:
-                    send_message(bot, new_error_message)
-                except YPBotError as error:
-                    logger.error(error, exc_info=True)
+        # Не в finally: SystemExit и KeyboardInterrupt должны завершать
+        # программу сразу, а не после очередной паузы.
+        error_message = send_error_message(
+            bot, new_error_message, error_message
+        )
 
-            time.sleep(RETRY_PERIOD)
+        time.sleep(retry_period)
 
 logger: LOGGER_ANNOTATION = get_logger()
 if __name__ == "__main__":
-
+    signal.signal(signal.SIGTERM, stop_bot)
     main()
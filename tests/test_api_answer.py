@@ -0,0 +1,101 @@
+import time
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+import requests
+
+from exceptions import YPBotError
+
+
+def make_response(content, http_status=HTTPStatus.OK):
+    response = requests.models.Response()
+    response.status_code = http_status
+    response._content = content
+    return response
+
+
+def mock_get_not_200(*args, **kwargs):
+    return make_response(b'{}', http_status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+
+def mock_get_with_exception(*args, **kwargs):
+    raise requests.RequestException('Something wrong')
+
+
+class TestApiAnswer:
+    VALID_BODY = (
+        '{"homeworks": [{"homework_name": "hw1", "status": "approved"}], '
+        '"current_date": 1000198000}'
+    ).encode('utf-8')
+
+    def test_decode_response_with_real_response(self, homework_module):
+        result = homework_module.decode_response(
+            make_response(self.VALID_BODY)
+        )
+        assert result == {
+            'homeworks': [{'homework_name': 'hw1', 'status': 'approved'}],
+            'current_date': 1000198000
+        }, (
+            'Проверьте, что тело ответа АПИ корректно десериализуется.'
+        )
+
+    def test_get_api_answer_with_real_response(self, monkeypatch,
+                                               homework_module):
+        monkeypatch.setattr(
+            requests, 'get',
+            lambda *args, **kwargs: make_response(self.VALID_BODY)
+        )
+        result = homework_module.get_api_answer(0)
+        assert result['current_date'] == 1000198000
+
+    @pytest.mark.parametrize('content', [b'', b'not json', b'{"homeworks": '])
+    def test_get_api_answer_with_invalid_body(self, monkeypatch, content,
+                                              homework_module):
+        monkeypatch.setattr(
+            requests, 'get', lambda *args, **kwargs: make_response(content)
+        )
+        with pytest.raises(YPBotError):
+            homework_module.get_api_answer(0)
+
+    @pytest.mark.parametrize('date_updated, expected_timestamp', [
+        ('2020-02-13T14:40:57Z', 1581604857),
+        ('2020-02-13T14:40:57.250000Z', 1581604857.25),
+    ])
+    def test_parse_datetime_returns_aware_utc(self, date_updated,
+                                              expected_timestamp,
+                                              homework_module):
+        result = homework_module.parse_datetime(date_updated)
+        assert result.utcoffset() == timedelta(0), (
+            'Дата из ответа АПИ должна разбираться как время в UTC.'
+        )
+        assert result.timestamp() == expected_timestamp
+
+    def test_get_api_answer_converts_datetime_to_epoch(self, monkeypatch,
+                                                       homework_module):
+        params = {}
+
+        def mock_get(*args, **kwargs):
+            params.update(kwargs['params'])
+            return make_response(self.VALID_BODY)
+
+        monkeypatch.setattr(requests, 'get', mock_get)
+        homework_module.get_api_answer(
+            homework_module.parse_datetime('2020-02-13T14:40:57Z')
+        )
+        assert params['from_date'] == 1581604857, (
+            'Проверьте, что дата передается в `from_date` как timestamp '
+            'в UTC, независимо от часового пояса сервера.'
+        )
+
+    @pytest.mark.parametrize('mock_get', [
+        mock_get_not_200, mock_get_with_exception
+    ])
+    def test_get_current_time_falls_back_to_now(self, monkeypatch, mock_get,
+                                                homework_module):
+        monkeypatch.setattr(requests, 'get', mock_get)
+        monkeypatch.setattr(time, 'time', lambda: 1000198000.5)
+        assert homework_module.get_current_time() == 1000198000, (
+            'Если АПИ недоступно при запуске, точкой отсчета должно '
+            'стать текущее время.'
+        )
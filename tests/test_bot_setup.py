@@ -0,0 +1,43 @@
+import logging
+
+
+class TestBotSetup:
+
+    def test_check_tokens_names_missing_variable(self, monkeypatch, caplog,
+                                                 homework_module):
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'sometoken')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', None)
+        with caplog.at_level(logging.CRITICAL):
+            assert homework_module.check_tokens() is False
+        critical_messages = [
+            record.message for record in caplog.records
+            if record.levelno == logging.CRITICAL
+        ]
+        assert len(critical_messages) == 1, (
+            'Убедитесь, что отсутствие переменных окружения логируется '
+            'с уровнем `CRITICAL`.'
+        )
+        assert 'CHAT_ID' in critical_messages[0], (
+            'Убедитесь, что в логе указано имя отсутствующей переменной.'
+        )
+        assert 'YP_TOKEN' not in critical_messages[0]
+        assert 'BOT_TOKEN' not in critical_messages[0]
+
+    def test_check_tokens_with_all_variables(self, monkeypatch, caplog,
+                                             homework_module):
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'sometoken')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+        with caplog.at_level(logging.CRITICAL):
+            assert homework_module.check_tokens() is True
+        assert not caplog.records
+
+    def test_get_logger_does_not_stack_handlers(self, homework_module):
+        homework_module.get_logger()
+        logger = homework_module.get_logger()
+        assert logger is homework_module.logger
+        assert len(logger.handlers) == 1, (
+            'Повторный вызов `get_logger()` не должен добавлять '
+            'обработчики логгеру.'
+        )
@@ -0,0 +1,273 @@
+import logging
+import os
+import signal
+import time
+
+import pytest
+import telegram
+
+import utils
+from exceptions import YPBotError
+
+
+def make_response(*homeworks, current_date=1000198000):
+    return {
+        'homeworks': list(homeworks),
+        'current_date': current_date
+    }
+
+
+class TestMainLoop:
+    HOMEWORK_VERDICTS = {
+        'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
+        'reviewing': 'Работа взята на проверку ревьюером.',
+        'rejected': 'Работа проверена: у ревьюера есть замечания.'
+    }
+
+    def run_main(self, monkeypatch, homework_module, responses,
+                 on_sleep=None, expected_exception=utils.BreakInfiniteLoop,
+                 failed_sends=0):
+        """
+        Run main() over the given API responses, one per loop iteration,
+        and stop after the last one. A response that is an exception
+        instance is raised instead of being returned. The first
+        `failed_sends` messages fail to send. Return the sent messages
+        and the pauses between requests; the timestamps passed to
+        get_api_answer are kept in `self.polled_timestamps`.
+        """
+        sent_messages = []
+        sleeps = []
+        self.polled_timestamps = []
+        send_attempts = []
+        polls = iter(responses)
+
+        def mock_get_api_answer(current_timestamp):
+            self.polled_timestamps.append(current_timestamp)
+            response = next(polls)
+            if isinstance(response, BaseException):
+                raise response
+            return response
+
+        def mock_send_message(bot, message):
+            send_attempts.append(message)
+            if len(send_attempts) <= failed_sends:
+                raise YPBotError('send_message', 'Ошибка в работе Телеграма')
+            sent_messages.append(message)
+
+        def mock_sleep(secs):
+            sleeps.append(secs)
+            if on_sleep is not None:
+                on_sleep()
+            if len(sleeps) == len(responses):
+                raise utils.BreakInfiniteLoop('break')
+
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'sometoken')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+        monkeypatch.setattr(
+            telegram, 'Bot', lambda **kwargs: utils.MockTelegramBot(**kwargs)
+        )
+        monkeypatch.setattr(homework_module, 'get_current_time', lambda: 0)
+        monkeypatch.setattr(
+            homework_module,
+            'get_api_answer',
+            mock_get_api_answer
+        )
+        monkeypatch.setattr(
+            homework_module, 'send_message', mock_send_message
+        )
+        monkeypatch.setattr(time, 'sleep', mock_sleep)
+
+        with pytest.raises(expected_exception):
+            homework_module.main()
+        return sent_messages, sleeps
+
+    def test_main_reports_every_homework_in_response(self, monkeypatch,
+                                                     homework_module):
+        response = make_response(
+            {'homework_name': 'hw1', 'status': 'approved'},
+            {'homework_name': 'hw2', 'status': 'rejected'},
+        )
+        sent_messages, _ = self.run_main(
+            monkeypatch, homework_module, [response]
+        )
+        assert len(sent_messages) == 1, (
+            'Обновления из одного ответа АПИ должны уходить одним сообщением.'
+        )
+        for homework in response['homeworks']:
+            assert f'"{homework["homework_name"]}"' in sent_messages[0], (
+                'Убедитесь, что в сообщение попадают все работы из ответа.'
+            )
+            assert (
+                self.HOMEWORK_VERDICTS[homework['status']] in sent_messages[0]
+            )
+
+    def test_main_reports_invalid_homework_in_batch(self, monkeypatch,
+                                                    homework_module):
+        response = make_response(
+            {'homework_name': 'hw1', 'status': 'approved'},
+            {'homework_name': 'hw2', 'status': 'unknown'},
+            {'status': 'reviewing'},
+        )
+        sent_messages, _ = self.run_main(
+            monkeypatch, homework_module, [response]
+        )
+        assert len(sent_messages) == 2, (
+            'Ожидаются два сообщения: обновление по корректной работе '
+            'и уведомление о сбое.'
+        )
+        assert sent_messages[0] == (
+            'Изменился статус проверки работы "hw1". '
+            f'{self.HOMEWORK_VERDICTS["approved"]}'
+        ), (
+            'Некорректная работа в ответе не должна мешать отправке '
+            'остальных.'
+        )
+        assert sent_messages[1].startswith('Сбой в работе программы'), (
+            'Убедитесь, что о пропущенных работах пользователь получает '
+            'сообщение о сбое.'
+        )
+        assert 'unknown' in sent_messages[1]
+        assert 'homework_name' in sent_messages[1]
+
+    def test_main_invalid_homework_is_not_no_updates(self, monkeypatch,
+                                                     homework_module):
+        response = make_response(
+            {'homework_name': 'hw1', 'status': 'unknown'}
+        )
+        sent_messages, sleeps = self.run_main(
+            monkeypatch, homework_module, [response, response]
+        )
+        assert len(sent_messages) == 1, (
+            'Сообщение о сбое должно отправляться один раз, без повторов.'
+        )
+        assert sent_messages[0].startswith('Сбой в работе программы')
+        assert sleeps == [600, 600], (
+            'Ответ с некорректной работой не должен увеличивать паузу '
+            'между запросами.'
+        )
+
+    def test_main_backs_off_while_no_updates(self, monkeypatch,
+                                             homework_module):
+        _, sleeps = self.run_main(
+            monkeypatch, homework_module, [make_response()] * 5
+        )
+        assert sleeps == [600, 1200, 1800, 1800, 1800], (
+            'Пока обновлений нет, пауза должна удваиваться начиная со '
+            'второго пустого ответа и не превышать `MAX_RETRY_PERIOD`.'
+        )
+
+    def test_main_resets_back_off_after_send(self, monkeypatch,
+                                             homework_module):
+        update = make_response({'homework_name': 'hw1', 'status': 'approved'})
+        _, sleeps = self.run_main(
+            monkeypatch,
+            homework_module,
+            [make_response()] * 3 + [update] + [make_response()] * 2
+        )
+        assert sleeps == [600, 1200, 1800, 600, 600, 1200], (
+            'После отправки обновления пауза должна сбрасываться до '
+            '`RETRY_PERIOD`.'
+        )
+
+    def test_main_does_not_repeat_same_status(self, monkeypatch,
+                                              homework_module):
+        response = make_response(
+            {'homework_name': 'hw1', 'status': 'reviewing'}
+        )
+        sent_messages, _ = self.run_main(
+            monkeypatch, homework_module, [response, response]
+        )
+        assert len(sent_messages) == 1, (
+            'Повторный статус работы не должен отправляться снова.'
+        )
+
+    def test_main_reports_status_returned_to_review(self, monkeypatch,
+                                                    homework_module):
+        sent_messages, _ = self.run_main(
+            monkeypatch,
+            homework_module,
+            [
+                make_response({'homework_name': 'hw1', 'status': status})
+                for status in ('reviewing', 'rejected', 'reviewing')
+            ]
+        )
+        assert len(sent_messages) == 3, (
+            'Работа, вернувшаяся на проверку после замечаний, должна '
+            'снова попадать в уведомления.'
+        )
+        assert sent_messages[-1].endswith(self.HOMEWORK_VERDICTS['reviewing'])
+
+    def test_stop_bot_exits_cleanly(self, caplog, homework_module):
+        with utils.check_logging(caplog, level=logging.INFO, message=(
+            'Убедитесь, что остановка бота по сигналу логируется.'
+        )):
+            with pytest.raises(SystemExit) as exit_info:
+                homework_module.stop_bot(signal.SIGTERM, None)
+        assert exit_info.value.code == 0, (
+            'Остановка по SIGTERM должна завершать программу с кодом 0.'
+        )
+
+    def test_sigterm_interrupts_pause(self, monkeypatch, homework_module):
+        previous_handler = signal.signal(
+            signal.SIGTERM, homework_module.stop_bot
+        )
+        try:
+            _, sleeps = self.run_main(
+                monkeypatch,
+                homework_module,
+                [make_response()] * 2,
+                on_sleep=lambda: os.kill(os.getpid(), signal.SIGTERM),
+                expected_exception=SystemExit,
+            )
+        finally:
+            signal.signal(signal.SIGTERM, previous_handler)
+        assert len(sleeps) == 1, (
+            'SIGTERM во время паузы должен сразу завершать программу.'
+        )
+
+    def test_main_does_not_install_signal_handler(self, monkeypatch,
+                                                  homework_module):
+        handler = signal.getsignal(signal.SIGTERM)
+        self.run_main(monkeypatch, homework_module, [make_response()])
+        assert signal.getsignal(signal.SIGTERM) is handler, (
+            'Обработчик SIGTERM устанавливается только при запуске скрипта, '
+            'а не при вызове `main()`.'
+        )
+
+    def test_main_exits_on_interrupt_without_pause(self, monkeypatch,
+                                                   homework_module):
+        sent_messages, sleeps = self.run_main(
+            monkeypatch,
+            homework_module,
+            [KeyboardInterrupt()],
+            expected_exception=KeyboardInterrupt,
+        )
+        assert sleeps == [], (
+            'KeyboardInterrupt должен завершать программу без паузы.'
+        )
+        assert sent_messages == []
+
+    def test_main_keeps_timestamp_after_failed_send(self, monkeypatch,
+                                                    homework_module):
+        response = make_response(
+            {'homework_name': 'hw1', 'status': 'approved'},
+            current_date=1000198500
+        )
+        sent_messages, _ = self.run_main(
+            monkeypatch,
+            homework_module,
+            [response, response, make_response(current_date=1000199000)],
+            failed_sends=1,
+        )
+        assert self.polled_timestamps == [0, 0, 1000198500], (
+            'Точка отсчета не должна сдвигаться, пока обновления '
+            'не отправлены в Telegram.'
+        )
+        assert any(
+            self.HOMEWORK_VERDICTS['approved'] in message
+            for message in sent_messages
+        ), (
+            'Обновление, которое не удалось отправить, должно быть '
+            'отправлено при следующем запросе.'
+        )
@@ -1,3 +1,4 @@
+import json
 import logging
 from collections import namedtuple
 from contextlib import contextmanager
@@ -83,6 +84,10 @@ class MockResponseGET:
         self.text = ''
         logging.warn(MockResponseGET.CALLED_LOG_MSG)
 
+    @property
+    def content(self):
+        return json.dumps(self.json()).encode('utf-8')
+
     def json(self):
         data = {
             "homeworks": [],